@@ -7,20 +7,27 @@ to provide a modern REST API for word pattern searching.
 
 import asyncio
 import os
+import shutil
 import signal
+import stat
 import subprocess
 import logging
-from typing import Optional, AsyncGenerator, List, Dict, Any, Union
+import time
+from collections import OrderedDict
+from types import MappingProxyType
+from contextlib import asynccontextmanager
+from typing import Optional, AsyncGenerator, Awaitable, Callable, List, Dict, Any, Union, Iterable, Mapping, Tuple
 import resource
 
+import orjson
 from fastapi import FastAPI, Query, HTTPException, BackgroundTasks, Request, APIRouter
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse, JSONResponse
+from fastapi.responses import StreamingResponse, JSONResponse, ORJSONResponse, PlainTextResponse, Response
 from pydantic import BaseModel, Field
 import uvicorn
 
 # Configure logging
-logging.basicConfig(level=logging.INFO)
+logging.basicConfig(level=os.getenv("NUTRIMATIC_LOG_LEVEL", "INFO").upper())
 logger = logging.getLogger(__name__)
 
 app = FastAPI(
@@ -43,6 +50,72 @@ MAX_COMPUTATION = int(os.getenv("NUTRIMATIC_MAX_COMPUTATION", "1000000"))
 CPU_LIMIT = int(os.getenv("NUTRIMATIC_CPU_LIMIT", "30"))
 MEMORY_LIMIT = int(os.getenv("NUTRIMATIC_MEMORY_LIMIT", "2147483648"))  # 2GB
 FIND_EXPR_BINARY = os.getenv("NUTRIMATIC_FIND_EXPR", "find-expr")
+FIND_EXPR_PATH = shutil.which(FIND_EXPR_BINARY)  # Resolved once so spawns skip the PATH search
+PRLIMIT_BINARY = shutil.which("prlimit")  # Applies rlimits without a preexec_fn when available
+READ_CHUNK_SIZE = 65536  # Bytes per read from the find-expr stdout pipe
+STREAM_QUEUE_SIZE = 4  # Batches of SSE events buffered per /search/stream client
+TERMINATE_TIMEOUT = 1.0  # Seconds to wait for find-expr to exit after SIGTERM
+POOL_SIZE = int(os.getenv("NUTRIMATIC_POOL_SIZE", "4"))  # find-expr workers per dictionary, 0 disables the pool
+CACHE_RESULTS = int(os.getenv("NUTRIMATIC_CACHE_RESULTS", "50000"))  # Result rows cached per worker, 0 disables the cache
+CACHE_TTL = float(os.getenv("NUTRIMATIC_CACHE_TTL", "3600"))  # Seconds
+AVAILABILITY_REFRESH_INTERVAL = 60  # Seconds between dictionary file checks
+
+# Server settings used when main.py is run directly. Every uvicorn worker
+# process starts its own find-expr pool, so up to
+# WORKERS × POOL_SIZE × available dictionaries find-expr processes run at once.
+WORKERS = int(os.getenv("NUTRIMATIC_WORKERS", "0")) or os.cpu_count() or 2  # 0 means one per CPU
+LIMIT_CONCURRENCY = int(os.getenv("NUTRIMATIC_LIMIT_CONCURRENCY", "64"))  # Per worker; excess requests get a 503, 0 disables the cap
+UNLIMITED_PATHS = frozenset({"/health"})  # Always served, so probes don't fail under load
+
+class ConcurrencyLimitMiddleware:
+    """
+    Answer requests beyond a per-process cap with a 503, like uvicorn's
+    limit_concurrency, except for exempt paths. Health checks must keep
+    answering while the searches are saturated, or a busy pod gets
+    restarted and loses every search in flight.
+    """
+
+    def __init__(self, app, limit: int, exempt: Iterable[str]):
+        self.app = app
+        self.limit = limit
+        self.exempt = frozenset(exempt)
+        self.active = 0
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or self.limit <= 0 or scope["path"] in self.exempt:
+            await self.app(scope, receive, send)
+            return
+        if self.active >= self.limit:
+            response = PlainTextResponse("Service Unavailable", status_code=503)
+            await response(scope, receive, send)
+            return
+        self.active += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.active -= 1
+
+app.add_middleware(ConcurrencyLimitMiddleware, limit=LIMIT_CONCURRENCY, exempt=UNLIMITED_PATHS)
+
+# Leading bytes of find-expr output lines
+HASH_BYTE = ord("#")  # Control and progress lines
+ZERO_BYTE = ord("0")  # Scores below 1.0
+
+# Server-Sent Events framing
+SSE_PREFIX = b"data: "
+SSE_SUFFIX = b"\n\n"
+SSE_DONE = SSE_PREFIX + orjson.dumps({"type": "done"}) + SSE_SUFFIX
+
+try:
+    from parse import parse_result_line  # Compiled from parse.pyx in the Docker image
+except ImportError:
+    def parse_result_line(line: bytes) -> Optional[Tuple[float, str]]:
+        """Split a "<score> <text>" line into (score, text); None if there is no text"""
+        sp = line.find(b" ")
+        if sp < 0:
+            return None
+        # Index text is plain ASCII
+        return float(line[:sp]), line[sp + 1:].decode("ascii", "replace")
 
 # Dictionary configuration with logarithmic scale mapping
 DICTIONARIES = {
@@ -70,6 +143,13 @@ DICTIONARIES = {
     }
 }
 
+# Per-request view of DICTIONARIES: id -> (display name, index path as bytes
+# for exec, index path)
+DICTIONARY_FILES: Mapping[str, Tuple[str, bytes, str]] = MappingProxyType({
+    dict_id: (dict_info["name"], os.fsencode(dict_info["file"]), dict_info["file"])
+    for dict_id, dict_info in DICTIONARIES.items()
+})
+
 # Response models
 class SearchResult(BaseModel):
     text: str
@@ -95,109 +175,455 @@ class Dictionary(BaseModel):
 class DictionariesResponse(BaseModel):
     dictionaries: List[Dictionary]
 
-def set_resource_limits():
+def set_resource_limits(cpu_hard_limit: int = CPU_LIMIT):
     """Set CPU and memory limits for the process"""
     try:
         # Set CPU limit
-        resource.setrlimit(resource.RLIMIT_CPU, (CPU_LIMIT, CPU_LIMIT))
+        resource.setrlimit(resource.RLIMIT_CPU, (CPU_LIMIT, cpu_hard_limit))
         
         # Set memory limit
         resource.setrlimit(resource.RLIMIT_AS, (MEMORY_LIMIT, MEMORY_LIMIT))
-        
-        # Ignore SIGPIPE for subprocess communication
-        signal.signal(signal.SIGPIPE, signal.SIG_DFL)
     except Exception as e:
-        logger.warning(f"Failed to set resource limits: {e}")
+        logger.warning("Failed to set resource limits: %s", e)
 
-async def run_find_expr(query: str, index_file: str, max_computation: int = MAX_COMPUTATION) -> AsyncGenerator[str, None]:
+def set_worker_resource_limits():
     """
-    Run the find-expr binary and yield results line by line
+    Set limits for a pooled find-expr worker. The CPU hard limit stays open so
+    the worker can give each query its own CPU_LIMIT budget.
     """
-    try:
-        # Create the subprocess
-        process = await asyncio.create_subprocess_exec(
-            FIND_EXPR_BINARY,
-            index_file, 
-            query,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-            preexec_fn=set_resource_limits
+    set_resource_limits(cpu_hard_limit=resource.RLIM_INFINITY)
+
+async def spawn_find_expr(*args: Union[str, bytes], worker: bool = False, **kwargs) -> asyncio.subprocess.Process:
+    """
+    Start find-expr with CPU and memory limits applied.
+
+    When prlimit(1) is installed the limits are set by exec'ing through it, so
+    no Python code has to run in the child and the event loop can use its
+    posix_spawn/vfork fast path. Otherwise fall back to a preexec_fn.
+    SIGPIPE is reset to its default in the child by the spawn itself.
+    """
+    if FIND_EXPR_PATH is None:
+        raise FileNotFoundError(FIND_EXPR_BINARY)
+    if PRLIMIT_BINARY is not None:
+        cpu_limit = f"{CPU_LIMIT}:unlimited" if worker else str(CPU_LIMIT)
+        return await asyncio.create_subprocess_exec(
+            PRLIMIT_BINARY,
+            f"--cpu={cpu_limit}",
+            f"--as={MEMORY_LIMIT}",
+            FIND_EXPR_PATH,
+            *args,
+            close_fds=False,  # subprocess only uses posix_spawn without close_fds
+            **kwargs
         )
-        
-        # Read lines from stdout
-        while True:
-            line = await process.stdout.readline()
+    return await asyncio.create_subprocess_exec(
+        FIND_EXPR_PATH,
+        *args,
+        preexec_fn=set_worker_resource_limits if worker else set_resource_limits,
+        **kwargs
+    )
+
+class FindExprWorker:
+    """A long-lived find-expr process answering one query per stdin line"""
+
+    def __init__(self, process: asyncio.subprocess.Process):
+        self.process = process
+        self.reusable = False  # Set once the current query's "#END" was read
+
+class WorkerPool:
+    """
+    Pool of long-lived find-expr processes, keyed by index file.
+
+    A worker only goes back to the pool after answering a query completely;
+    a worker abandoned mid-query is killed and replaced in the background.
+    Requests never wait for a worker: when none is idle, callers run the
+    query in a dedicated process instead.
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self._idle: Dict[str, asyncio.Queue] = {}
+        self._live: Dict[str, int] = {}
+        self._tasks = set()
+        self._closed = False
+
+    def serves(self, index_file: bytes) -> bool:
+        return not self._closed and self._live.get(index_file, 0) > 0
+
+    async def start(self, index_files: Iterable[bytes]):
+        for index_file in index_files:
+            self._idle[index_file] = asyncio.Queue()
+            self._live[index_file] = 0
+            for _ in range(self.size):
+                await self._spawn(index_file)
+            logger.info("Started %d find-expr worker(s) for %s", self._live[index_file], os.fsdecode(index_file))
+
+    async def stop(self):
+        self._closed = True
+        for task in self._tasks:
+            task.cancel()
+        for queue in self._idle.values():
+            while not queue.empty():
+                worker = queue.get_nowait()
+                if worker.process.returncode is None:
+                    worker.process.kill()
+                await worker.process.wait()
+
+    @asynccontextmanager
+    async def acquire(self, index_file: bytes) -> AsyncGenerator[Optional[FindExprWorker], None]:
+        """Lend out an idle worker, or None if every worker is busy"""
+        queue = self._idle[index_file]
+        worker = None
+        while worker is None and not queue.empty():
+            worker = queue.get_nowait()
+            if worker.process.returncode is not None:
+                # Died while idle (e.g. killed externally)
+                self._retire(index_file, worker)
+                worker = None
+        if worker is None:
+            yield None
+            return
+
+        try:
+            yield worker
+        finally:
+            if worker.reusable and worker.process.returncode is None:
+                worker.reusable = False
+                queue.put_nowait(worker)
+            else:
+                self._retire(index_file, worker)
+
+    async def _spawn(self, index_file: bytes):
+        try:
+            process = await spawn_find_expr(
+                index_file,
+                worker=True,
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE
+            )
+        except Exception as e:
+            logger.warning("Failed to start find-expr worker for %s: %s", os.fsdecode(index_file), e)
+            return
+        self._live[index_file] += 1
+        self._idle[index_file].put_nowait(FindExprWorker(process))
+
+    def _retire(self, index_file: bytes, worker: FindExprWorker):
+        if worker.process.returncode is None:
+            worker.process.kill()
+        self._live[index_file] -= 1
+        if self._closed:
+            return
+        task = asyncio.create_task(self._replace(index_file, worker))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _replace(self, index_file: bytes, worker: FindExprWorker):
+        await worker.process.wait()
+        await self._spawn(index_file)
+
+worker_pool = WorkerPool(POOL_SIZE)
+
+class ResultCache:
+    """
+    LRU cache of query results, with entries expiring after a TTL.
+
+    The cache is bounded by the total number of result rows it holds rather
+    than by entry count, since one entry can hold anything from zero to a
+    thousand results.
+    """
+
+    def __init__(self, max_results: int, ttl: float):
+        self.max_results = max_results
+        self.ttl = ttl
+        self._entries: OrderedDict = OrderedDict()  # key -> (expires, size, value)
+        self._size = 0
+
+    def get(self, key) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires, size, value = entry
+        if expires < time.monotonic():
+            del self._entries[key]
+            self._size -= size
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, key, value, size: int):
+        size = max(size, 1)  # Empty results still take an entry
+        if size > self.max_results:
+            return
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._size -= old[1]
+        self._entries[key] = (time.monotonic() + self.ttl, size, value)
+        self._size += size
+        while self._size > self.max_results:
+            _, (_, evicted_size, _) = self._entries.popitem(last=False)
+            self._size -= evicted_size
+
+result_cache = ResultCache(CACHE_RESULTS, CACHE_TTL)
+
+async def _pump_lines(
+    process: asyncio.subprocess.Process,
+    max_computation: int,
+    on_line: Callable[[bytes], bool],
+    on_control: Callable[[bytes], None],
+    drain: Optional[Callable[[], Awaitable[None]]] = None,
+    until_end: bool = False
+) -> Optional[bool]:
+    """
+    Feed raw find-expr output lines to the callbacks.
+
+    Returns True after a "#END" line, False once on_line returns False or
+    the computation limit is reached (reported as "#LIMIT_REACHED:<count>"),
+    and None at EOF. drain, if given, is awaited after each chunk's lines
+    and before the next read, so a slow consumer holds back find-expr.
+
+    Pooled workers stop by themselves at the same limits and then print
+    "#END", so with until_end the remaining lines are skipped up to it
+    instead of returning False, leaving the worker ready for reuse.
+    """
+    # Read stdout in large chunks and split lines locally; one await per
+    # chunk instead of one per line. Lines stay bytes so callers only decode
+    # the text they actually use.
+    pending = b""
+    stopped = False
+    while True:
+        chunk = await process.stdout.read(READ_CHUNK_SIZE)
+        if not chunk:
+            if not pending:
+                return None
+            chunk = b"\n"  # Flush a final unterminated line
+        data = pending + chunk if pending else chunk
+
+        start = 0
+        while (end := data.find(b"\n", start)) >= 0:
+            line = data[start:end].strip()
+            start = end + 1
             if not line:
-                break
-                
-            line_str = line.decode().strip()
-            if not line_str:
                 continue
-                
-            # Handle computation limit lines
-            if line_str.startswith("#"):
+
+            if line[0] == HASH_BYTE:
+                if line == b"#END":
+                    return True
+                if line.startswith((b"#ERROR:", b"#LIMIT_REACHED:")):
+                    on_control(line)
+                    continue
+                # Computation progress lines
                 try:
-                    computation_count = int(line_str[1:])
+                    computation_count = int(line[1:])
                     if computation_count >= max_computation:
-                        yield f"#LIMIT_REACHED:{computation_count}"
-                        break
+                        on_control(b"#LIMIT_REACHED:%d" % computation_count)
+                        return False
                 except ValueError:
                     pass
                 continue
-                
-            yield line_str
-            
-        # Wait for process to complete
+
+            if stopped:
+                continue
+            if not on_line(line):
+                if not until_end:
+                    return False
+                stopped = True
+        pending = data[start:]
+        if drain is not None:
+            await drain()
+
+async def _submit(
+    process: asyncio.subprocess.Process,
+    query: str,
+    max_results: int,
+    max_computation: int,
+    min_score: float
+) -> bool:
+    """Send a query and its limits to a pooled worker; False if the worker has gone away"""
+    try:
+        process.stdin.write(f"{max_results} {max_computation} {min_score!r} {query}\n".encode())
+        await process.stdin.drain()
+    except (BrokenPipeError, ConnectionResetError):
+        return False
+    return True
+
+async def _exit_error(process: asyncio.subprocess.Process) -> Optional[str]:
+    """Wait for find-expr to exit and describe the failure, if any"""
+    await process.wait()
+    if process.returncode == 0:
+        return None
+
+    stderr = await process.stderr.read()
+    error_msg = stderr.decode().strip()
+    if error_msg:
+        return error_msg
+    elif process.returncode == -signal.SIGXCPU:
+        return "Query timed out (too much CPU time)"
+    elif process.returncode < 0:
+        return f"Process killed by signal {-process.returncode}"
+    else:
+        return f"Process exited with code {process.returncode}"
+
+async def _terminate(process: asyncio.subprocess.Process):
+    """Stop a find-expr process whose remaining output is not needed"""
+    process.terminate()
+    try:
+        await asyncio.wait_for(process.wait(), TERMINATE_TIMEOUT)
+    except asyncio.TimeoutError:
+        process.kill()
         await process.wait()
+
+async def stream_find_expr(
+    query: str,
+    index_file: bytes,
+    max_computation: int,
+    on_line: Callable[[bytes], bool],
+    on_control: Callable[[bytes], None],
+    drain: Optional[Callable[[], Awaitable[None]]] = None,
+    max_results: int = 0,
+    min_score: float = 0.0
+):
+    """
+    Run the find-expr binary and pass its output to plain callbacks.
+
+    on_line receives each raw result line ("<score> <text>") and returns
+    False to stop the search early. on_control receives "#LIMIT_REACHED:<n>"
+    and "#ERROR:<message>" lines; no more lines follow either of them.
+    Both are called synchronously from the event loop and must not raise.
+    drain is awaited between output chunks; see _pump_lines.
+
+    max_results (0 for no limit) and min_score repeat the point at which
+    on_line stops the search. Pooled workers are given them along with
+    max_computation so they stop by themselves and stay reusable; only a
+    client going away or a crash costs a worker.
+    """
+    process = None
+    try:
+        # Pooled workers read one query per line as a C string, so queries
+        # with a newline or NUL fall back to a dedicated process (where exec
+        # rejects the NUL), as do queries that find every worker busy or get
+        # one that has died (it is retired on release)
+        if worker_pool.serves(index_file) and "\n" not in query and "\0" not in query:
+            async with worker_pool.acquire(index_file) as worker:
+                if worker is not None and await _submit(worker.process, query, max_results, max_computation, min_score):
+                    finished = await _pump_lines(worker.process, max_computation, on_line, on_control, drain, until_end=True)
+                    if finished:
+                        # The worker reached "#END" and can be reused
+                        worker.reusable = True
+                    elif finished is None:
+                        error_msg = await _exit_error(worker.process) or "find-expr worker exited unexpectedly"
+                        on_control(f"#ERROR:{error_msg}".encode())
+                    return
+
+        # Create the subprocess
+        process = await spawn_find_expr(
+            index_file, 
+            query,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
         
-        # Check for errors
-        if process.returncode != 0:
-            stderr = await process.stderr.read()
-            error_msg = stderr.decode().strip()
+        if await _pump_lines(process, max_computation, on_line, on_control, drain) is None:
+            # Wait for process to complete and check for errors
+            error_msg = await _exit_error(process)
             if error_msg:
-                yield f"#ERROR:{error_msg}"
-            elif process.returncode == -signal.SIGXCPU:
-                yield "#ERROR:Query timed out (too much CPU time)"
-            elif process.returncode < 0:
-                yield f"#ERROR:Process killed by signal {-process.returncode}"
-            else:
-                yield f"#ERROR:Process exited with code {process.returncode}"
+                on_control(f"#ERROR:{error_msg}".encode())
                 
     except FileNotFoundError:
-        yield f"#ERROR:find-expr binary not found at {FIND_EXPR_BINARY}"
+        on_control(f"#ERROR:find-expr binary not found at {FIND_EXPR_BINARY}".encode())
     except Exception as e:
-        yield f"#ERROR:Unexpected error: {str(e)}"
+        on_control(f"#ERROR:Unexpected error: {str(e)}".encode())
+    finally:
+        # Stop a dedicated process whose remaining output is not needed;
+        # pooled workers abandoned mid-query are killed by the pool
+        if process is not None and process.returncode is None:
+            await _terminate(process)
+
+# Dictionary availability is checked on a timer rather than per request, and
+# the /health and /dictionaries responses are pre-encoded from the result.
+# They are only rebuilt when a file's modification time changes.
+AVAILABLE_DICTS: Dict[str, bool] = {}
+DICTIONARIES_LIST: List[Dictionary] = []
+DICTIONARIES_JSON_BYTES = b""
+HEALTH_JSON_BYTES = b""
+_availability_mtimes: Optional[Tuple[Optional[float], ...]] = None
+
+def _file_mtime(path: Union[str, bytes]) -> Optional[float]:
+    """Modification time of a regular file, or None if there is none at path"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime if stat.S_ISREG(st.st_mode) else None
+
+def refresh_available_dicts():
+    """Check the dictionary files and find-expr binary, rebuilding the cached responses if they changed"""
+    global DICTIONARIES_JSON_BYTES, HEALTH_JSON_BYTES, _availability_mtimes
+
+    mtimes = tuple(_file_mtime(index_file) for _, _, index_file in DICTIONARY_FILES.values())
+    binary_mtime = _file_mtime(FIND_EXPR_BINARY)
+    if mtimes + (binary_mtime,) == _availability_mtimes:
+        return
+    _availability_mtimes = mtimes + (binary_mtime,)
+
+    for dict_id, mtime in zip(DICTIONARY_FILES, mtimes):
+        AVAILABLE_DICTS[dict_id] = mtime is not None
+
+    DICTIONARIES_LIST[:] = [
+        Dictionary(
+            id=dict_id,
+            name=dict_info["name"],
+            description=dict_info["description"],
+            default=dict_info["default"],
+            available=AVAILABLE_DICTS[dict_id],
+            scale_mapping=dict_info["scale_mapping"]
+        )
+        for dict_id, dict_info in DICTIONARIES.items()
+    ]
+    DICTIONARIES_JSON_BYTES = orjson.dumps(DictionariesResponse(dictionaries=DICTIONARIES_LIST).model_dump())
+    HEALTH_JSON_BYTES = orjson.dumps({
+        "status": "healthy",
+        "find_expr_binary": FIND_EXPR_BINARY,
+        "binary_exists": binary_mtime is not None,
+        "dictionaries": AVAILABLE_DICTS
+    })
+
+refresh_available_dicts()
+
+async def refresh_available_dicts_periodically():
+    while True:
+        await asyncio.sleep(AVAILABILITY_REFRESH_INTERVAL)
+        refresh_available_dicts()
+
+availability_task: Optional[asyncio.Task] = None
+
+@app.on_event("startup")
+async def start_availability_refresh():
+    global availability_task
+    availability_task = asyncio.create_task(refresh_available_dicts_periodically())
+
+@app.on_event("startup")
+async def start_worker_pool():
+    """Pre-spawn find-expr workers for every available dictionary"""
+    if POOL_SIZE > 0:
+        await worker_pool.start(
+            DICTIONARY_FILES[dict_id][1] for dict_id, available in AVAILABLE_DICTS.items() if available
+        )
+
+@app.on_event("shutdown")
+async def stop_background_tasks():
+    if availability_task is not None:
+        availability_task.cancel()
+    await worker_pool.stop()
 
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
-    # Check which dictionaries are available
-    available_dicts = {}
-    for dict_id, dict_info in DICTIONARIES.items():
-        available_dicts[dict_id] = os.path.isfile(dict_info["file"])
-    
-    return {
-        "status": "healthy",
-        "find_expr_binary": FIND_EXPR_BINARY,
-        "binary_exists": os.path.isfile(FIND_EXPR_BINARY),
-        "dictionaries": available_dicts
-    }
+    return Response(HEALTH_JSON_BYTES, media_type="application/json")
 
 @app.get("/dictionaries", response_model=DictionariesResponse)
 async def get_dictionaries():
     """Get available dictionaries"""
-    dictionaries = []
-    for dict_id, dict_info in DICTIONARIES.items():
-        dictionaries.append(Dictionary(
-            id=dict_id,
-            name=dict_info["name"],
-            description=dict_info["description"],
-            default=dict_info["default"],
-            available=os.path.isfile(dict_info["file"]),
-            scale_mapping=dict_info["scale_mapping"]
-        ))
-    
-    return DictionariesResponse(dictionaries=dictionaries)
+    return Response(DICTIONARIES_JSON_BYTES, media_type="application/json")
 
 @app.get("/search", response_model=SearchResponse)
 async def search(
@@ -212,56 +638,77 @@ async def search(
     """
     if not q.strip():
         raise HTTPException(status_code=400, detail="Query cannot be empty")
+    if "\0" in q:
+        raise HTTPException(status_code=400, detail="Query cannot contain NUL characters")
     
     # Validate dictionary
-    if dictionary not in DICTIONARIES:
+    dict_files = DICTIONARY_FILES.get(dictionary)
+    if dict_files is None:
         raise HTTPException(status_code=400, detail=f"Unknown dictionary: {dictionary}")
     
-    dict_info = DICTIONARIES[dictionary]
-    index_file = dict_info["file"]
+    dict_name, index_file, _ = dict_files
     
     # Check if dictionary file exists
-    if not os.path.isfile(index_file):
-        raise HTTPException(status_code=404, detail=f"Dictionary file not found: {dict_info['name']}")
+    if not AVAILABLE_DICTS[dictionary]:
+        raise HTTPException(status_code=404, detail=f"Dictionary file not found: {dict_name}")
     
-    results = []
+    cache_key = ("search", dictionary, q.strip(), limit, offset, max_computation)
+    cached = result_cache.get(cache_key)
+    if cached is not None:
+        results, rank, computation_limit_reached = cached
+        return ORJSONResponse({
+            "query": q,
+            "dictionary": dictionary,
+            "results": results,
+            "total_results": rank,
+            "computation_limit_reached": computation_limit_reached,
+            "error": None
+        })
+
+    # Results are plain dicts shaped like SearchResult; the response is
+    # serialized directly, without building and validating a model per item
+    results: List[Optional[Dict[str, Any]]] = [None] * limit
+    count = 0
     rank = 0
     computation_limit_reached = False
     error = None
-    
-    async for line in run_find_expr(q.strip(), index_file, max_computation):
-        if line.startswith("#LIMIT_REACHED:"):
-            computation_limit_reached = True
-            break
-        elif line.startswith("#ERROR:"):
-            error = line[7:]  # Remove "#ERROR:" prefix
-            break
-            
+
+    def on_line(line: bytes) -> bool:
+        nonlocal count, rank
         try:
             # Parse score and text
-            parts = line.split(" ", 1)
-            if len(parts) == 2:
-                score = float(parts[0])
-                text = parts[1]
-                
+            parsed = parse_result_line(line)
+            if parsed is not None:
                 # Apply offset/limit
                 if rank >= offset:
-                    if len(results) >= limit:
-                        break
-                    results.append(SearchResult(text=text, score=score, rank=rank))
+                    results[count] = {"text": parsed[1], "score": parsed[0], "rank": rank}
+                    count += 1
                 rank += 1
-        except (ValueError, IndexError):
-            logger.warning(f"Failed to parse result line: {line}")
-            continue
+        except ValueError:
+            logger.warning("Failed to parse result line: %s", line)
+        return count < limit
+
+    def on_control(line: bytes):
+        nonlocal computation_limit_reached, error
+        if line.startswith(b"#LIMIT_REACHED:"):
+            computation_limit_reached = True
+        else:
+            error = line[7:].decode(errors="replace")  # Remove "#ERROR:" prefix
+
+    await stream_find_expr(q.strip(), index_file, max_computation, on_line, on_control, max_results=offset + limit)
     
-    return SearchResponse(
-        query=q,
-        dictionary=dictionary,
-        results=results,
-        total_results=rank,
-        computation_limit_reached=computation_limit_reached,
-        error=error
-    )
+    del results[count:]
+    if error is None:
+        result_cache.put(cache_key, (results, rank, computation_limit_reached), len(results))
+
+    return ORJSONResponse({
+        "query": q,
+        "dictionary": dictionary,
+        "results": results,
+        "total_results": rank,
+        "computation_limit_reached": computation_limit_reached,
+        "error": error
+    })
 
 @app.get("/search/stream")
 async def search_stream(
@@ -274,47 +721,72 @@ async def search_stream(
     """
     if not q.strip():
         raise HTTPException(status_code=400, detail="Query cannot be empty")
+    if "\0" in q:
+        raise HTTPException(status_code=400, detail="Query cannot contain NUL characters")
     
     # Validate dictionary
-    if dictionary not in DICTIONARIES:
+    dict_files = DICTIONARY_FILES.get(dictionary)
+    if dict_files is None:
         raise HTTPException(status_code=400, detail=f"Unknown dictionary: {dictionary}")
     
-    dict_info = DICTIONARIES[dictionary]
-    index_file = dict_info["file"]
+    dict_name, index_file, _ = dict_files
     
     # Check if dictionary file exists
-    if not os.path.isfile(index_file):
-        raise HTTPException(status_code=404, detail=f"Dictionary file not found: {dict_info['name']}")
+    if not AVAILABLE_DICTS[dictionary]:
+        raise HTTPException(status_code=404, detail=f"Dictionary file not found: {dict_name}")
 
     async def generate_results():
+        # find-expr output is parsed by callbacks in a separate task. Each
+        # chunk's SSE events go on a bounded queue as one batch, and the task
+        # waits for room before reading more, so a slow client holds back
+        # find-expr instead of growing the buffer; None marks the end
+        events: asyncio.Queue = asyncio.Queue(STREAM_QUEUE_SIZE)
+        batch: List[bytes] = []
         rank = 0
-        async for line in run_find_expr(q.strip(), index_file, max_computation):
-            if line.startswith("#LIMIT_REACHED:"):
-                yield f"data: {{'type': 'limit_reached', 'computation': {line.split(':')[1]}}}\n\n"
-                break
-            elif line.startswith("#ERROR:"):
-                error_msg = line[7:]  # Remove "#ERROR:" prefix
-                yield f"data: {{'type': 'error', 'message': '{error_msg}'}}\n\n"
-                break
-                
+
+        def on_line(line: bytes) -> bool:
+            nonlocal rank
             try:
                 # Parse score and text
-                parts = line.split(" ", 1)
-                if len(parts) == 2:
-                    score = float(parts[0])
-                    text = parts[1].replace("'", "\\'")  # Escape quotes for JSON
-                    
-                    yield f"data: {{'type': 'result', 'data': {{'text': '{text}', 'score': {score}, 'rank': {rank}}}}}\n\n"
+                parsed = parse_result_line(line)
+                if parsed is not None:
+                    payload = orjson.dumps({"type": "result", "data": {"text": parsed[1], "score": parsed[0], "rank": rank}})
+                    batch.append(SSE_PREFIX + payload + SSE_SUFFIX)
                     rank += 1
-            except (ValueError, IndexError):
-                logger.warning(f"Failed to parse result line: {line}")
-                continue
+            except ValueError:
+                logger.warning("Failed to parse result line: %s", line)
+            return True
+
+        def on_control(line: bytes):
+            if line.startswith(b"#LIMIT_REACHED:"):
+                payload = orjson.dumps({"type": "limit_reached", "computation": int(line[15:])})
+            else:
+                payload = orjson.dumps({"type": "error", "message": line[7:].decode(errors="replace")})  # Remove "#ERROR:" prefix
+            batch.append(SSE_PREFIX + payload + SSE_SUFFIX)
+
+        async def drain():
+            if batch:
+                await events.put(b"".join(batch))
+                batch.clear()
+
+        async def search():
+            await stream_find_expr(q.strip(), index_file, max_computation, on_line, on_control, drain)
+            await drain()
+            await events.put(None)
+
+        search_task = asyncio.create_task(search())
+        try:
+            while (event := await events.get()) is not None:
+                yield event
+        finally:
+            # Stops find-expr if the client went away mid-stream
+            search_task.cancel()
         
-        yield f"data: {{'type': 'done'}}\n\n"
+        yield SSE_DONE
 
     return StreamingResponse(
         generate_results(),
-        media_type="text/plain",
+        media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
             "Connection": "keep-alive",
@@ -390,6 +862,63 @@ TIPS:
 - Scores indicate frequency/commonality in the corpus
 """
 
+# Static MCP tool and manifest definitions, built once at import
+NUTRIMATIC_SEARCH_TOOL = MCPTool(
+    name="nutrimatic_search",
+    description="Search Nutrimatic word databases. Supports anagrams, wildcards, boolean logic, etc. See main manifest description for full syntax.",
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "pattern": {
+                "type": "string",
+                "description": "The search pattern (e.g., '<listen>', 'c*t')."
+            },
+            "dictionary": {
+                "type": "string",
+                "enum": ["wikipedia", "12dicts"],
+                "default": "wikipedia",
+                "description": "Dictionary ('wikipedia' or '12dicts')."
+            },
+            "max_results": {
+                "type": "integer",
+                "default": 10,
+                "minimum": 1,
+                "maximum": 100,
+                "description": "Max results (1-100)."
+            }
+        },
+        "required": ["pattern"]
+    },
+    outputSchema={
+        "type": "object",
+        "properties": {
+            "content": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "type": {
+                            "type": "string",
+                            "enum": ["text"]
+                        },
+                        "text": {
+                            "type": "string"
+                        }
+                    },
+                    "required": ["type", "text"]
+                }
+            }
+        },
+        "required": ["content"]
+    }
+)
+NUTRIMATIC_SEARCH_TOOL_DICT = NUTRIMATIC_SEARCH_TOOL.model_dump(exclude_none=True)
+# tools/list result: same tools as the manifest, under a 'tools' key
+TOOLS_LIST_RESULT = {"tools": [NUTRIMATIC_SEARCH_TOOL_DICT]}
+
+MCP_MANIFEST = MCPManifest(description=PATTERN_SYNTAX_DOCS, tools=[NUTRIMATIC_SEARCH_TOOL])
+MCP_MANIFEST_JSON_BYTES = orjson.dumps(MCP_MANIFEST.model_dump(exclude_none=True))
+
 # -- MCP Pydantic Models --
 
 # Model for parameters of the nutrimatic_search tool
@@ -414,6 +943,9 @@ class InitializeResult(BaseModel):
     capabilities: Dict[str, Any] = Field(default_factory=lambda: {"tools": {}}) # Updated capabilities
     # schemas: Optional[Dict[str, Any]] = None # Schemas can be returned here if dynamic
 
+# The initialize result never changes, so it is dumped once
+INITIALIZE_RESULT_DICT = InitializeResult().model_dump()
+
 class JsonRpcErrorObject(BaseModel):
     code: int
     message: str
@@ -434,46 +966,62 @@ async def nutrimatic_search_internal(
 ) -> List[SearchResult]:
     if not pattern.strip():
         raise HTTPException(status_code=400, detail="Pattern cannot be empty")
+    if "\0" in pattern:
+        raise HTTPException(status_code=400, detail="Pattern cannot contain NUL characters")
 
-    if dictionary_name not in DICTIONARIES:
+    dict_files = DICTIONARY_FILES.get(dictionary_name)
+    if dict_files is None:
         raise HTTPException(status_code=400, detail=f"Unknown dictionary: {dictionary_name}")
 
-    dict_info = DICTIONARIES[dictionary_name]
-    index_file = dict_info["file"]
+    dict_name, index_file, _ = dict_files
+
+    if not AVAILABLE_DICTS[dictionary_name]:
+        raise HTTPException(status_code=404, detail=f"Dictionary file not found: {dict_name}")
 
-    if not os.path.isfile(index_file):
-        raise HTTPException(status_code=404, detail=f"Dictionary file not found: {dict_info['name']}")
+    cache_key = ("mcp", dictionary_name, pattern.strip(), max_results)
+    cached = result_cache.get(cache_key)
+    if cached is not None:
+        return cached
 
     results: List[SearchResult] = []
     rank = 0 # For SearchResult model, though MCP output doesn't use rank directly
     # computation_limit_reached = False # Not directly exposed in MCP success result, error handles it
-    # error = None # Handled by exceptions or specific error returns
-
-    async for line in run_find_expr(pattern.strip(), index_file, MAX_COMPUTATION):
-        if line.startswith("#LIMIT_REACHED:"):
-            # If limit is reached before any results, this could be an error or empty result based on requirements
-            # For now, we just stop collecting. If results are empty, it implies limit before valid items.
-            # computation_limit_reached = True
-            break
-        elif line.startswith("#ERROR:"):
-            # error_detail = line[7:]
-            raise HTTPException(status_code=500, detail=f"Search backend error: {line[7:]}")
-            
+    error = None # Raised as an HTTPException once find-expr has stopped
+
+    def on_line(line: bytes) -> bool:
+        nonlocal rank
+        # MCP requirement: score >= 1.0. find-expr prints results in
+        # descending score order, so the first lower score ends the search
+        # (and stops find-expr). Scores print as "%.8g", so a leading "0"
+        # means a score below 1.0 without parsing the float.
+        if line[0] == ZERO_BYTE:
+            return False
+
         try:
-            parts = line.split(" ", 1)
-            if len(parts) == 2:
-                score_val = float(parts[0])
-                text_val = parts[1]
-                
-                if score_val >= 1.0: # MCP requirement: score >= 1.0
-                    results.append(SearchResult(text=text_val, score=score_val, rank=rank))
-                    rank += 1 # rank is for the SearchResult model, not strictly for MCP output array index
-                    if len(results) >= max_results:
-                        break 
-        except (ValueError, IndexError) as e:
-            logger.warning(f"Failed to parse result line during internal search: {line}, Error: {e}")
-            continue
+            parsed = parse_result_line(line)
+            if parsed is not None:
+                score_val, text_val = parsed
+                if score_val < 1.0:
+                    return False
+
+                results.append(SearchResult(text=text_val, score=score_val, rank=rank))
+                rank += 1 # rank is for the SearchResult model, not strictly for MCP output array index
+        except ValueError as e:
+            logger.warning("Failed to parse result line during internal search: %s, Error: %s", line, e)
+        return len(results) < max_results
+
+    def on_control(line: bytes):
+        nonlocal error
+        # If the limit is reached we just stop collecting. If results are
+        # empty, it implies limit before valid items.
+        if line.startswith(b"#ERROR:"):
+            error = line[7:].decode(errors="replace")
+
+    await stream_find_expr(pattern.strip(), index_file, MAX_COMPUTATION, on_line, on_control, max_results=max_results, min_score=1.0)
+    if error is not None:
+        raise HTTPException(status_code=500, detail=f"Search backend error: {error}")
     
+    result_cache.put(cache_key, results, len(results))
     return results
 
 mcp_service_router = APIRouter()
@@ -484,76 +1032,23 @@ async def get_mcp_manifest_for_service():
     MCP manifest endpoint - provides tool definitions for AI agents
     Accessible via GET /api/mcp (externally through nginx)
     """
-    return MCPManifest(
-        description=PATTERN_SYNTAX_DOCS,
-        tools=[
-            MCPTool(
-                name="nutrimatic_search",
-                description="Search Nutrimatic word databases. Supports anagrams, wildcards, boolean logic, etc. See main manifest description for full syntax.",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "pattern": {
-                            "type": "string",
-                            "description": "The search pattern (e.g., '<listen>', 'c*t')."
-                        },
-                        "dictionary": {
-                            "type": "string",
-                            "enum": ["wikipedia", "12dicts"],
-                            "default": "wikipedia",
-                            "description": "Dictionary ('wikipedia' or '12dicts')."
-                        },
-                        "max_results": {
-                            "type": "integer",
-                            "default": 10,
-                            "minimum": 1,
-                            "maximum": 100,
-                            "description": "Max results (1-100)."
-                        }
-                    },
-                    "required": ["pattern"]
-                },
-                outputSchema={
-                    "type": "object",
-                    "properties": {
-                        "content": {
-                            "type": "array",
-                            "items": {
-                                "type": "object",
-                                "properties": {
-                                    "type": {
-                                        "type": "string",
-                                        "enum": ["text"]
-                                    },
-                                    "text": {
-                                        "type": "string"
-                                    }
-                                },
-                                "required": ["type", "text"]
-                            }
-                        }
-                    },
-                    "required": ["content"]
-                }
-            )
-        ]
-    )
+    return Response(MCP_MANIFEST_JSON_BYTES, media_type="application/json")
 
 @mcp_service_router.post("/mcp", response_model=JsonRpcResponse, summary="MCP JSON-RPC Endpoint", response_model_exclude_none=True)
 async def handle_mcp_rpc(request_data: JsonRpcRequest):
-    logging.info(f"MCP RPC call received: method='{request_data.method}', id='{request_data.id}'")
+    logging.info("MCP RPC call received: method='%s', id='%s'", request_data.method, request_data.id)
     if request_data.params:
-        logging.debug(f"MCP RPC params: {request_data.params}")
+        logging.debug("MCP RPC params: %s", request_data.params)
 
     if request_data.method == "initialize":
         client_info = {}
         if isinstance(request_data.params, dict):
             client_info = request_data.params.get("clientInfo", {})
             client_protocol = request_data.params.get("protocolVersion", "N/A")
-        logging.info(f"MCP Initialize from: {client_info.get('name', 'Unknown')} v{client_info.get('version', 'N/A')}, client protocol: {client_protocol}")
+        logging.info("MCP Initialize from: %s v%s, client protocol: %s", client_info.get('name', 'Unknown'), client_info.get('version', 'N/A'), client_protocol)
         
         return JsonRpcResponse(
-            result=InitializeResult().model_dump(), 
+            result=INITIALIZE_RESULT_DICT,
             id=request_data.id
         )
     
@@ -566,7 +1061,7 @@ async def handle_mcp_rpc(request_data: JsonRpcRequest):
         try:
             tool_params = NutrimaticSearchParams(**request_data.params)
         except ValidationError as e:
-            logging.warning(f"MCP nutrimatic_search param validation error: {e.errors()}", exc_info=False)
+            logging.warning("MCP nutrimatic_search param validation error: %s", e.errors(), exc_info=False)
             return JsonRpcResponse(
                 error=JsonRpcErrorObject(code=-32602, message="Invalid parameters for nutrimatic_search.", data=e.errors()),
                 id=request_data.id
@@ -602,20 +1097,20 @@ async def handle_mcp_rpc(request_data: JsonRpcRequest):
             }, id=request_data.id)
         
         except HTTPException as he:
-            logging.error(f"MCP tool execution HTTPException for nutrimatic_search: {he.detail}", exc_info=True)
+            logging.error("MCP tool execution HTTPException for nutrimatic_search: %s", he.detail, exc_info=True)
             return JsonRpcResponse(
                 error=JsonRpcErrorObject(code=-32000, message="Tool execution failed.", data=str(he.detail)),
                 id=request_data.id
             )
         except Exception as e:
-            logging.error(f"MCP tool execution unexpected error for nutrimatic_search: {str(e)}", exc_info=True)
+            logging.error("MCP tool execution unexpected error for nutrimatic_search: %s", e, exc_info=True)
             return JsonRpcResponse(
                 error=JsonRpcErrorObject(code=-32000, message="An unexpected error occurred during tool execution."),
                 id=request_data.id
             )
     
     elif request_data.method == "tools/call": # Handle the generic tools/call wrapper
-        logging.info(f"MCP tools/call received, id='{request_data.id}'")
+        logging.info("MCP tools/call received, id='%s'", request_data.id)
         if not isinstance(request_data.params, dict):
             return JsonRpcResponse(
                 error=JsonRpcErrorObject(code=-32602, message="Invalid params: Expected object for tools/call parameters."),
@@ -635,7 +1130,7 @@ async def handle_mcp_rpc(request_data: JsonRpcRequest):
             try:
                 tool_params = NutrimaticSearchParams(**tool_arguments) # Use the extracted arguments
             except ValidationError as e:
-                logging.warning(f"MCP nutrimatic_search (via tools/call) param validation error: {e.errors()}", exc_info=False)
+                logging.warning("MCP nutrimatic_search (via tools/call) param validation error: %s", e.errors(), exc_info=False)
                 return JsonRpcResponse(
                     error=JsonRpcErrorObject(code=-32602, message="Invalid parameters for nutrimatic_search.", data=e.errors()),
                     id=request_data.id
@@ -667,13 +1162,13 @@ async def handle_mcp_rpc(request_data: JsonRpcRequest):
                     ]
                 }, id=request_data.id)
             except HTTPException as he:
-                logging.error(f"MCP tool execution (via tools/call) HTTPException for {tool_name}: {he.detail}", exc_info=True)
+                logging.error("MCP tool execution (via tools/call) HTTPException for %s: %s", tool_name, he.detail, exc_info=True)
                 return JsonRpcResponse(
                     error=JsonRpcErrorObject(code=-32000, message=f"Tool execution failed for {tool_name}.", data=str(he.detail)),
                     id=request_data.id
                 )
             except Exception as e:
-                logging.error(f"MCP tool execution (via tools/call) unexpected error for {tool_name}: {str(e)}", exc_info=True)
+                logging.error("MCP tool execution (via tools/call) unexpected error for %s: %s", tool_name, e, exc_info=True)
                 return JsonRpcResponse(
                     error=JsonRpcErrorObject(code=-32000, message=f"An unexpected error occurred during {tool_name} execution."),
                     id=request_data.id
@@ -686,64 +1181,11 @@ async def handle_mcp_rpc(request_data: JsonRpcRequest):
             )
     
     elif request_data.method == "tools/list": # Handle tools/list method
-        logging.info(f"MCP tools/list call received, id='{request_data.id}'")
-        # Construct the list of tools, similar to the manifest
-        # but format as expected by tools/list result (usually an object with a 'tools' key)
-        tools_list = [
-            MCPTool(
-                name="nutrimatic_search",
-                description="Search Nutrimatic word databases. Supports anagrams, wildcards, boolean logic, etc. See main manifest description for full syntax.",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "pattern": {
-                            "type": "string",
-                            "description": "The search pattern (e.g., '<listen>', 'c*t')."
-                        },
-                        "dictionary": {
-                            "type": "string",
-                            "enum": ["wikipedia", "12dicts"],
-                            "default": "wikipedia",
-                            "description": "Dictionary ('wikipedia' or '12dicts')."
-                        },
-                        "max_results": {
-                            "type": "integer",
-                            "default": 10,
-                            "minimum": 1,
-                            "maximum": 100,
-                            "description": "Max results (1-100)."
-                        }
-                    },
-                    "required": ["pattern"]
-                },
-                outputSchema={
-                    "type": "object",
-                    "properties": {
-                        "content": {
-                            "type": "array",
-                            "items": {
-                                "type": "object",
-                                "properties": {
-                                    "type": {
-                                        "type": "string",
-                                        "enum": ["text"]
-                                    },
-                                    "text": {
-                                        "type": "string"
-                                    }
-                                },
-                                "required": ["type", "text"]
-                            }
-                        }
-                    },
-                    "required": ["content"]
-                }
-            ).model_dump(exclude_none=True) # Use model_dump for clean dicts
-        ]
-        return JsonRpcResponse(result={"tools": tools_list}, id=request_data.id)
+        logging.info("MCP tools/list call received, id='%s'", request_data.id)
+        return JsonRpcResponse(result=TOOLS_LIST_RESULT, id=request_data.id)
             
     else:
-        logging.warning(f"MCP method not found: {request_data.method}")
+        logging.warning("MCP method not found: %s", request_data.method)
         # For JSON-RPC, method not found should typically return HTTP 200,
         # with the error indicated in the JSON body.
         return JsonRpcResponse( # Return HTTP 200 with error in body
@@ -754,4 +1196,14 @@ async def handle_mcp_rpc(request_data: JsonRpcRequest):
 app.include_router(mcp_service_router)
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8000) 
\ No newline at end of file
+    # Workers need the app as an import string so each process can load it
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=8000,
+        workers=WORKERS,
+        loop="uvloop",
+        http="httptools",
+        backlog=512,
+        timeout_keep_alive=90  # Longer than the Discord bot's pooled connections idle
+    )
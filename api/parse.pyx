@@ -0,0 +1,31 @@
+# cython: language_level=3
+"""
+Compiled parser for find-expr result lines.
+
+Built into the API image with cythonize; main.py falls back to an
+equivalent pure-Python parse_result_line when this module isn't compiled.
+"""
+
+from cpython.bytes cimport PyBytes_AS_STRING, PyBytes_GET_SIZE
+from cpython.unicode cimport PyUnicode_DecodeASCII
+from libc.stdlib cimport strtod
+from libc.string cimport memchr
+
+
+def parse_result_line(bytes line):
+    """Split a "<score> <text>" line into (score, text); None if there is no text"""
+    cdef const char *start = PyBytes_AS_STRING(line)
+    cdef Py_ssize_t size = PyBytes_GET_SIZE(line)
+    cdef const char *sp = <const char *>memchr(start, c' ', size)
+    cdef char *end
+    cdef double score
+
+    if sp == NULL:
+        return None
+
+    score = strtod(start, &end)
+    if end == start or end != sp:
+        raise ValueError(f"could not convert score to float: {line[:sp - start]!r}")
+
+    # Index text is plain ASCII
+    return score, PyUnicode_DecodeASCII(sp + 1, size - (sp - start) - 1, "replace")
@@ -10,13 +10,19 @@ import os
 import asyncio
 import logging
 import math
-from typing import List, Optional, Dict, Any
+import string
+import time
+from collections import OrderedDict
+from bisect import bisect_right
+from functools import lru_cache
+from itertools import zip_longest
+from typing import List, Optional, Dict, Any, Tuple
 import aiohttp
+import orjson
 import discord
 from discord import app_commands
 from discord.ext import commands
 from dotenv import load_dotenv
-import re
 
 # Import encoding functions
 from text_encodings import encode_text, get_encoding_choices
@@ -36,6 +42,32 @@ DISCORD_TOKEN = os.getenv('DISCORD_BOT_TOKEN')
 API_BASE_URL = os.getenv('NUTRIMATIC_API_URL', 'http://api:8000')
 DEFAULT_DICTIONARY = os.getenv('DEFAULT_DICTIONARY', '12dicts')
 MAX_RESULTS = int(os.getenv('MAX_RESULTS', '36'))
+SEARCH_CACHE_SIZE = int(os.getenv('SEARCH_CACHE_SIZE', '512'))  # Cached API responses, 0 disables the cache
+SEARCH_CACHE_TTL = float(os.getenv('SEARCH_CACHE_TTL', '300'))  # Seconds
+
+# Message for a search with nothing to show
+NO_RESULTS_TEMPLATE = "```\nNo results found for pattern: {}\n```"
+
+# Deletes every character the /encode command accepts (checked after
+# upper-casing), so anything left over is invalid input
+ENCODE_INPUT_STRIP = str.maketrans('', '', string.ascii_uppercase + string.digits + ' ')
+
+# Frequency tier (name, indicator, color code) for each whole score from 0
+# to 9; scores below 0 use the first entry and scores of 9 or more the last
+_TIER_LOWEST = ('lowest', "·", "\033[0;30m")
+_TIER_LOW = ('low', "▎", "\033[0;32m")
+_TIER_LOW_MID = ('low_mid', "▌", "\033[0;37m")
+_TIER_MID = ('mid', "▊", "\033[0;37m")
+_TIER_HIGH = ('high', "█", "\033[0;37m")
+_TIER_HIGHEST = ('highest', "✪", "\033[1;36m")
+SCORE_TIERS = (
+    _TIER_LOWEST,
+    _TIER_LOW, _TIER_LOW,
+    _TIER_LOW_MID, _TIER_LOW_MID,
+    _TIER_MID, _TIER_MID,
+    _TIER_HIGH, _TIER_HIGH,
+    _TIER_HIGHEST,
+)
 
 # Discord configuration
 intents = discord.Intents.default()
@@ -44,37 +76,78 @@ intents.message_content = True
 class NutrimaticBot(commands.Bot):
     def __init__(self):
         super().__init__(command_prefix='/', intents=intents)
+        self.http_session: Optional[aiohttp.ClientSession] = None
+        self.api: Optional['NutrimaticAPI'] = None
     
     async def setup_hook(self):
         """Called when the bot is starting up"""
+        # One HTTP session for the bot's lifetime, so connections to the API
+        # are kept alive and reused across commands
+        self.http_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=50,
+                limit_per_host=10,
+                keepalive_timeout=75,  # Below the API's keep-alive timeout
+                ttl_dns_cache=600,
+                enable_cleanup_closed=True
+            ),
+            # sock_connect rather than connect, which would also count time
+            # spent waiting for a free pooled connection behind slow searches
+            timeout=aiohttp.ClientTimeout(total=30, sock_connect=5)
+        )
+        self.api = NutrimaticAPI(API_BASE_URL, self.http_session)
+        
         # Sync slash commands with Discord
         try:
             synced = await self.tree.sync()
             logger.info(f"Synced {len(synced)} command(s)")
         except Exception as e:
             logger.error(f"Failed to sync commands: {e}")
+    
+    async def close(self):
+        """Close the API session along with the Discord connection"""
+        await super().close()
+        if self.http_session:
+            await self.http_session.close()
 
 bot = NutrimaticBot()
 
 class NutrimaticAPI:
     """API client for communicating with the Nutrimatic backend"""
     
-    def __init__(self, base_url: str):
+    def __init__(self, base_url: str, session: aiohttp.ClientSession):
         self.base_url = base_url.rstrip('/')
-        self.session = None
-    
-    async def __aenter__(self):
-        self.session = aiohttp.ClientSession()
-        return self
-    
-    async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.session:
-            await self.session.close()
-    
-    async def search_pattern(self, pattern: str, dictionary: str = DEFAULT_DICTIONARY, limit: int = MAX_RESULTS) -> Dict[str, Any]:
-        """Search for a pattern using the Nutrimatic API"""
-        if not self.session:
-            raise RuntimeError("API client not initialized. Use 'async with' context manager.")
+        self.session = session
+        # Successful responses by (pattern, dictionary, limit), oldest first,
+        # with the monotonic time they were fetched
+        self._cache: OrderedDict[Tuple[str, str, int], Tuple[float, Dict[str, Any]]] = OrderedDict()
+    
+    def _cached(self, key: Tuple[str, str, int]) -> Optional[Dict[str, Any]]:
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        fetched, result = entry
+        if time.monotonic() - fetched >= SEARCH_CACHE_TTL:
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return result
+    
+    def _store(self, key: Tuple[str, str, int], result: Dict[str, Any]):
+        if SEARCH_CACHE_SIZE <= 0:
+            return
+        self._cache[key] = (time.monotonic(), result)
+        self._cache.move_to_end(key)
+        if len(self._cache) > SEARCH_CACHE_SIZE:
+            self._cache.popitem(last=False)
+    
+    async def search_pattern(self, pattern: str, dictionary: str = DEFAULT_DICTIONARY, limit: int = MAX_RESULTS, use_cache: bool = True) -> Dict[str, Any]:
+        """Search for a pattern using the Nutrimatic API, reusing recent results unless use_cache is False"""
+        cache_key = (pattern, dictionary, limit)
+        if use_cache:
+            cached = self._cached(cache_key)
+            if cached is not None:
+                return cached
         
         url = f"{self.base_url}/search"
         # Request extra results to allow for filling partial rows
@@ -87,9 +160,12 @@ class NutrimaticAPI:
         }
         
         try:
-            async with self.session.get(url, params=params, timeout=30) as response:
+            async with self.session.get(url, params=params) as response:
                 if response.status == 200:
-                    return await response.json()
+                    result = orjson.loads(await response.read())
+                    if not result.get('error'):
+                        self._store(cache_key, result)
+                    return result
                 else:
                     error_text = await response.text()
                     logger.error(f"API error {response.status}: {error_text}")
@@ -113,109 +189,50 @@ class NutrimaticAPI:
                 'total_results': 0
             }
 
-def get_display_width(text: str) -> int:
-    """Calculate the display width of text, accounting for ANSI codes and emoji"""
-    # Remove ANSI escape sequences for width calculation
-    ansi_escape = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
-    clean_text = ansi_escape.sub('', text)
-    
-    width = 0
-    for char in clean_text:
-        # Check for specific emoji we use: ��🟡⚪
-        if char in ['🟢', '🟡', '⚪']:
-            width += 2  # These emoji take up 2 display units in monospace
-        elif ord(char) > 0x1F000:  # Other emoji range detection
-            width += 2
-        else:
-            width += 1
-    return width
+@lru_cache(maxsize=1024)
+def format_results_header(pattern: str, dictionary: str, count: int) -> str:
+    """Create the message header - make pattern prominent, other info less so"""
+    return (
+        f"🔍 Nutrimatic Search\n# Pattern: **`{pattern}`**\n"
+        f"-# {dictionary.title()} dictionary • {count} {'result' if count == 1 else 'results'}\n"
+    )
 
-def format_results_multicolumn(results: List[Dict[str, Any]], pattern: str, dictionary: str, total_results: int, format_type: str = "friendly", requested_count: int = MAX_RESULTS) -> str:
-    """Format search results in a beautiful multicolumn layout for Discord"""
+def format_results_raw(results: List[Dict[str, Any]], pattern: str, dictionary: str, total_results: int, requested_count: int = MAX_RESULTS) -> str:
+    """Format search results as a plain word list, one per line"""
     
     if not results:
-        return f"```\nNo results found for pattern: {pattern}\n```"
+        return NO_RESULTS_TEMPLATE.format(pattern)
     
-    # Create header - make pattern prominent, other info less so
-    header = f"🔍 Nutrimatic Search\n# Pattern: **`{pattern}`**\n"
+    word_list = "\n".join(result['text'] for result in results[:requested_count])
+    return "".join([format_results_header(pattern, dictionary, total_results), "```\n", word_list, "\n```"])
 
-    # Raw format: just list words one per line
-    if format_type == "raw":
-        word_list = "\n".join(result['text'] for result in results[:requested_count])
-        header += f"-# {dictionary.title()} dictionary • {total_results} {'result' if total_results == 1 else 'results'}\n"
-        return header + f"```\n{word_list}\n```" 
-
-    # Prepare formatted items with frequency indicators
-    # Group results by frequency tier to minimize ANSI codes
-    frequency_tiers = []
+def format_results_multicolumn(results: List[Dict[str, Any]], pattern: str, dictionary: str, total_results: int, requested_count: int = MAX_RESULTS) -> str:
+    """Format search results in a beautiful multicolumn layout for Discord"""
+    
+    if not results:
+        return NO_RESULTS_TEMPLATE.format(pattern)
+    
+    # Prepare formatted items with frequency indicators, emitting a color
+    # code only where the tier changes to minimize ANSI codes
+    formatted_items = []
+    widths = []  # Display width of each item; indicators are 1 unit wide
     current_tier = None
-    current_group = []
     
     for result in results:
-        score = result['score']
+        text = result['text']
         
         # Determine frequency tier
-        if score >= 9:
-            tier = 'highest'
-            freq_indicator = "✪"
-            color_code = "\033[1;36m"
-        elif score >= 7:
-            tier = 'high'
-            freq_indicator = "█"
-            color_code = "\033[0;37m"
-        elif score >= 5:
-            tier = 'mid'
-            freq_indicator = "▊"
-            color_code = "\033[0;37m"
-        elif score >= 3:
-            tier = 'low_mid'
-            freq_indicator = "▌"
-            color_code = "\033[0;37m"
-        elif score >= 1:
-            tier = 'low'
-            freq_indicator = "▎"
-            color_code = "\033[0;32m"
-        else:
-            tier = 'lowest'
-            freq_indicator = "·"
-            color_code = "\033[0;30m"
+        tier, freq_indicator, color_code = SCORE_TIERS[min(max(int(result['score']), 0), 9)]
         
-        # If tier changed, start a new group
-        if current_tier != tier:
-            if current_group:
-                frequency_tiers.append((current_tier, current_group))
+        if tier != current_tier:
+            # First item in tier: include color change
+            formatted_items.append(f"{color_code}{freq_indicator} {text}")
             current_tier = tier
-            current_group = [(freq_indicator, result['text'], color_code)]
         else:
-            current_group.append((freq_indicator, result['text'], color_code))
-    
-    # Add the last group
-    if current_group:
-        frequency_tiers.append((current_tier, current_group))
-    
-    # Build formatted items with minimal ANSI codes
-    formatted_items = []
-    raw_items = []
-    
-    for tier, group in frequency_tiers:
-        if not group:
-            continue
-            
-        # Get color code from first item in group
-        color_code = group[0][2]
+            # Subsequent items: just use the indicator and text (color already set)
+            formatted_items.append(f"{freq_indicator} {text}")
         
-        # Add color change at start of tier
-        current_color = color_code
-        
-        for i, (freq_indicator, text, _) in enumerate(group):
-            raw_items.append(f"X {text}")
-            
-            if i == 0:
-                # First item in tier: include color change
-                formatted_items.append(f"{current_color}{freq_indicator} {text}")
-            else:
-                # Subsequent items: just use the indicator and text (color already set)
-                formatted_items.append(f"{freq_indicator} {text}")
+        widths.append(len(text) + 2)
     
     # Add final reset at the end
     if formatted_items:
@@ -228,26 +245,40 @@ def format_results_multicolumn(results: List[Dict[str, Any]], pattern: str, dict
     
     # Find the longest item to estimate column width
     if not formatted_items:
-        return f"```\nNo results found for pattern: {pattern}\n```"
+        return NO_RESULTS_TEMPLATE.format(pattern)
     
-    max_item_width = max(get_display_width(item) for item in raw_items[:requested_count])
+    # Words are plain ASCII, so an item ("X word") is as wide as the word plus 2
+    max_item_width = 2 + max(len(result['text']) for result in results[:requested_count])
     
-    # Calculate how many columns we can fit
-    if max_item_width + column_spacing > max_table_width:
-        num_columns = 1
-    else:
-        # Estimate columns: (width + spacing) * cols - spacing <= max_width
-        num_columns = min(3, (max_table_width + column_spacing) // (max_item_width + column_spacing))
-        num_columns = max(1, num_columns)  # At least 1 column
-    
-    # If we have very short words, allow more than 3 columns
-    if max_item_width <= 8:
-        num_columns = min(6, (max_table_width + column_spacing) // (max_item_width + column_spacing))
+    # Calculate how many columns we can fit: (width + spacing) * cols - spacing
+    # <= max_width, with at least 1 column and at most 3 (6 for very short words)
+    max_columns = 6 if max_item_width <= 8 else 3
+    num_columns = max(1, min(max_columns, (max_table_width + column_spacing) // (max_item_width + column_spacing)))
     
     # Determine how many results to actually use
     # Fill out partial rows if we have extra results
     base_results = requested_count
     rows_needed = (base_results + num_columns - 1) // num_columns
+    
+    # Ensure we don't exceed Discord's 2000 character limit by choosing the
+    # number of rows up front. Rows are padded to the column widths and
+    # joined with column spacing, but right-stripped, so the last column only
+    # counts its items' own widths. The rest of the message is the header,
+    # the code fence and the color codes.
+    def table_length(rows: int) -> int:
+        end = rows * num_columns
+        padded_width = sum(
+            max(max(widths[col_idx:end:num_columns], default=0), 6) + column_spacing
+            for col_idx in range(num_columns - 1)
+        )
+        return rows * (padded_width + 1) + sum(widths[num_columns - 1:end:num_columns])
+    
+    candidates = rows_needed * num_columns
+    ansi_length = sum(len(item) for item in formatted_items[:candidates]) - sum(widths[:candidates])
+    # The header can't be longer than with every result counted
+    header_len = len(format_results_header(pattern, dictionary, len(results)))
+    budget = 1950 - header_len - len("```ansi\n\n```") - ansi_length
+    rows_needed = max(1, bisect_right(range(1, rows_needed + 1), budget, key=table_length))
     total_slots = rows_needed * num_columns
     
     # Use extra results to fill out the last row if available
@@ -255,58 +286,32 @@ def format_results_multicolumn(results: List[Dict[str, Any]], pattern: str, dict
     display_items = formatted_items[:results_to_use]
     
     # Create column data
-    columns = [[] for _ in range(num_columns)]
-    for i, item in enumerate(display_items):
-        col_index = i % num_columns
-        columns[col_index].append(item)
-    
-    # Pad columns to same length
-    max_col_length = max(len(col) for col in columns) if columns else 0
-    for col in columns:
-        while len(col) < max_col_length:
-            col.append("")
+    columns = [display_items[col_idx::num_columns] for col_idx in range(num_columns)]
     
     # Calculate actual column widths based on display width
-    col_widths = []
-    for col in columns:
-        if col and any(item for item in col):  # Check if column has any non-empty items
-            max_width = max(get_display_width(item) for item in col if item)
-            col_widths.append(max(max_width, 6))  # Minimum width of 6
-        else:
-            col_widths.append(6)
+    col_widths = [
+        max(max(widths[col_idx:results_to_use:num_columns], default=0), 6)  # Minimum width of 6
+        for col_idx in range(num_columns)
+    ]
     
     # Build the formatted table
     table_lines = []
-    for row_idx in range(max_col_length):
+    # Short columns are filled out with "" to make whole rows
+    for row_idx, row in enumerate(zip_longest(*columns, fillvalue="")):
         row_parts = []
-        for col_idx, col in enumerate(columns):
-            if row_idx < len(col) and col[row_idx]:
-                item = col[row_idx]
-                # Calculate padding needed based on display width
-                display_width = get_display_width(item)
-                padding_needed = max(0, col_widths[col_idx] - display_width)
-                padded_item = item + (" " * padding_needed)
-                row_parts.append(padded_item)
+        for col_idx, item in enumerate(row):
+            if item:
+                # Pad to the column's display width; the invisible ANSI codes
+                # are the difference between len(item) and its display width
+                ansi_len = len(item) - widths[row_idx * num_columns + col_idx]
+                row_parts.append(item.ljust(col_widths[col_idx] + ansi_len))
             else:
                 row_parts.append(" " * col_widths[col_idx])
         
         table_lines.append("  ".join(row_parts).rstrip())
     
-    header += f"-# {dictionary.title()} dictionary • {results_to_use} {'result' if results_to_use == 1 else 'results'}\n"
-
-    # Create footer with less prominent info
-    footer = f""
-    
-    # Combine everything
-    result_text = header + "```ansi\n" + "\n".join(table_lines) + "\n```" + footer
-    
-    # Ensure we don't exceed Discord's 2000 character limit
-    if len(result_text) > 1950:
-        # Reduce results and try again
-        reduced_count = requested_count - num_columns
-        return format_results_multicolumn(results, pattern, dictionary, total_results, format_type, reduced_count)
-    
-    return result_text
+    # Combine everything in one allocation
+    return "".join([format_results_header(pattern, dictionary, results_to_use), "```ansi\n", "\n".join(table_lines), "\n```"])
 
 @bot.event
 async def on_ready():
@@ -349,26 +354,25 @@ async def words_slash(interaction: discord.Interaction, pattern: str, dictionary
     await interaction.response.defer()
     
     try:
-        async with NutrimaticAPI(API_BASE_URL) as api:
-            # Search for the pattern
-            result = await api.search_pattern(pattern, dictionary, max_results)
-            
-            if result.get('error'):
-                await interaction.followup.send(f"❌ Search error: {result['error']}")
-                return
-            
-            # Format and send results
-            formatted_results = format_results_multicolumn(
-                result.get('results', []),
-                pattern,
-                result.get('dictionary', dictionary),
-                result.get('total_results', 0),
-                format,
-                max_results
-            )
-            
-            await interaction.followup.send(formatted_results)
-            
+        # Search for the pattern
+        result = await bot.api.search_pattern(pattern, dictionary, max_results)
+        
+        if result.get('error'):
+            await interaction.followup.send(f"❌ Search error: {result['error']}")
+            return
+        
+        # Format and send results: raw is a plain word list, friendly uses columns
+        formatter = format_results_raw if format == "raw" else format_results_multicolumn
+        formatted_results = formatter(
+            result.get('results', []),
+            pattern,
+            result.get('dictionary', dictionary),
+            result.get('total_results', 0),
+            max_results
+        )
+        
+        await interaction.followup.send(formatted_results)
+        
     except Exception as e:
         logger.error(f"Error in words command: {e}")
         await interaction.followup.send(f"❌ An unexpected error occurred: {str(e)}")
@@ -440,19 +444,18 @@ async def status_slash(interaction: discord.Interaction):
     await interaction.response.defer(ephemeral=True)
     
     try:
-        async with NutrimaticAPI(API_BASE_URL) as api:
-            # Test API connectivity with a simple search
-            result = await api.search_pattern("test", DEFAULT_DICTIONARY, 1)
-            
-            if result.get('error'):
-                status_msg = f"✅ **Bot Status:** Online\n❌ **API Status:** Error - {result['error']}"
-            else:
-                status_msg = f"✅ **Bot Status:** Online\n✅ **API Status:** Connected"
-                status_msg += f"\n📚 **Dictionary:** {DEFAULT_DICTIONARY.title()}"
-                status_msg += f"\n🔍 **Max Results:** {MAX_RESULTS}"
-            
-            await interaction.followup.send(status_msg)
-            
+        # Test API connectivity with a simple search, always sent to the API
+        result = await bot.api.search_pattern("test", DEFAULT_DICTIONARY, 1, use_cache=False)
+        
+        if result.get('error'):
+            status_msg = f"✅ **Bot Status:** Online\n❌ **API Status:** Error - {result['error']}"
+        else:
+            status_msg = f"✅ **Bot Status:** Online\n✅ **API Status:** Connected"
+            status_msg += f"\n📚 **Dictionary:** {DEFAULT_DICTIONARY.title()}"
+            status_msg += f"\n🔍 **Max Results:** {MAX_RESULTS}"
+        
+        await interaction.followup.send(status_msg)
+        
     except Exception as e:
         logger.error(f"Error in status command: {e}")
         await interaction.followup.send(f"✅ **Bot Status:** Online\n❌ **API Status:** Connection failed - {str(e)}")
@@ -474,7 +477,7 @@ async def encode_slash(interaction: discord.Interaction, encoding: str, text: Op
         text_to_encode = text
 
     # Validate input text (allow only A-Z, 0-9, space for now)
-    if not re.match(r"^[A-Z0-9 ]*$", text_to_encode.upper()):
+    if text_to_encode.upper().translate(ENCODE_INPUT_STRIP):
         await interaction.response.send_message(
             "❌ Invalid input. Only A-Z, 0-9, and spaces are currently supported for encoding.",
             ephemeral=True
@@ -1,9 +1,16 @@
 """
 Encoding schemes for the /encode Discord command
+
+The module type-checks with mypy and compiles with mypyc
+(`mypyc text_encodings.py`); the compiled extension gives the same output.
 """
 
+import sys
+from functools import lru_cache
+from typing import Final, Iterable, List
+
 # Braille mappings
-BRAILLE_MAP = {
+BRAILLE_MAP: Final = {
     'A': '⠁', 'B': '⠃', 'C': '⠉', 'D': '⠙', 'E': '⠑', 'F': '⠋', 'G': '⠛', 'H': '⠓',
     'I': '⠊', 'J': '⠚', 'K': '⠅', 'L': '⠇', 'M': '⠍', 'N': '⠝', 'O': '⠕', 'P': '⠏',
     'Q': '⠟', 'R': '⠗', 'S': '⠎', 'T': '⠞', 'U': '⠥', 'V': '⠧', 'W': '⠺', 'X': '⠭',
@@ -14,7 +21,7 @@ BRAILLE_MAP = {
 }
 
 # Morse code mappings
-MORSE_CODE_MAP = {
+MORSE_CODE_MAP: Final = {
     'A': '.-', 'B': '-...', 'C': '-.-.', 'D': '-..', 'E': '.', 'F': '..-.', 'G': '--.', 'H': '....',
     'I': '..', 'J': '.---', 'K': '-.-', 'L': '.-..', 'M': '--', 'N': '-.', 'O': '---', 'P': '.--.',
     'Q': '--.-', 'R': '.-.', 'S': '...', 'T': '-', 'U': '..-', 'V': '...-', 'W': '.--', 'X': '-..-',
@@ -25,7 +32,7 @@ MORSE_CODE_MAP = {
 }
 
 # NATO phonetic alphabet
-NATO_ALPHABET_MAP = {
+NATO_ALPHABET_MAP: Final = {
     'A': 'Alpha', 'B': 'Bravo', 'C': 'Charlie', 'D': 'Delta', 'E': 'Echo', 'F': 'Foxtrot',
     'G': 'Golf', 'H': 'Hotel', 'I': 'India', 'J': 'Juliet', 'K': 'Kilo', 'L': 'Lima',
     'M': 'Mike', 'N': 'November', 'O': 'Oscar', 'P': 'Papa', 'Q': 'Quebec', 'R': 'Romeo',
@@ -37,7 +44,7 @@ NATO_ALPHABET_MAP = {
 }
 
 # Semaphore flag positions (descriptions)
-SEMAPHORE_MAP = {
+SEMAPHORE_MAP: Final = {
     'A': 'Right down, left down-right', 'B': 'Right up, left down-right', 'C': 'Right up-right, left down-right',
     'D': 'Right up-left, left down-right', 'E': 'Right up-left, left down', 'F': 'Right up, left down',
     'G': 'Right up-right, left down', 'H': 'Right down-right, left down', 'I': 'Right down-left, left down',
@@ -56,13 +63,13 @@ SEMAPHORE_MAP = {
 }
 
 # Resistor color codes
-RESISTOR_COLOR_MAP = {
+RESISTOR_COLOR_MAP: Final = {
     '0': 'Black', '1': 'Brown', '2': 'Red', '3': 'Orange', '4': 'Yellow',
     '5': 'Green', '6': 'Blue', '7': 'Violet', '8': 'Gray', '9': 'White'
 }
 
 # Maritime signal flags
-MARITIME_FLAGS_MAP = {
+MARITIME_FLAGS_MAP: Final = {
     'A': 'Alpha (white and blue swallow-tail)', 'B': 'Bravo (red)', 'C': 'Charlie (horizontal blue-white-red-white-blue)',
     'D': 'Delta (yellow with blue vertical stripe)', 'E': 'Echo (blue over red)', 'F': 'Foxtrot (red diamond on white)',
     'G': 'Golf (vertical yellow-blue-yellow-blue-yellow-blue)', 'H': 'Hotel (vertical white-red)',
@@ -83,7 +90,7 @@ MARITIME_FLAGS_MAP = {
 }
 
 # American Sign Language descriptions (basic hand positions)
-ASL_MAP = {
+ASL_MAP: Final = {
     'A': 'Closed fist with thumb to side', 'B': 'Open palm with fingers up, thumb across palm',
     'C': 'Curved hand forming C shape', 'D': 'Index finger up, thumb and middle finger touching',
     'E': 'Fingers bent over thumb', 'F': 'Index and thumb touching, other fingers up',
@@ -103,120 +110,144 @@ ASL_MAP = {
     ' ': 'Open palm'
 }
 
+def _lookup_table(mapping: dict) -> list:
+    """Index a character map by codepoint for the Latin-1 range, '?' where unmapped"""
+    return [mapping.get(chr(i), '?') for i in range(256)]
+
+def _upper(text: str) -> str:
+    # upper() always copies, so hand back text that's already upper case as is
+    return text if text.isupper() else text.upper()
+
+def _unknown(codepoint: int) -> str:
+    return '?'
+
+def _join_lookup(table: list, separator: str, beyond, text: str) -> str:
+    """Join each character's token from a Latin-1 lookup table, asking beyond() past it"""
+    try:
+        # Iterating bytes yields codepoints directly, without an ord() per character
+        codepoints = text.encode('latin-1')
+    except UnicodeEncodeError:
+        return separator.join([table[o] if o < 256 else beyond(o) for o in map(ord, text)])
+    return separator.join([table[o] for o in codepoints])
+
+class _TranslateTable(dict):
+    """str.translate table that turns any unmapped character into '?'"""
+
+    def __missing__(self, key):
+        return '?'
+
+_BRAILLE_TABLE: Final = _TranslateTable({ord(k): v for k, v in BRAILLE_MAP.items()})
+
+def _encode_braille(text: str) -> str:
+    return text.translate(_BRAILLE_TABLE)
+
+_ASCII_STRS: Final = [str(i) for i in range(256)]
+
+# Complete per-character tokens for the ordinal and resistor schemes, indexed by
+# codepoint; anything outside A-Z, 0-9 and space encodes as '?'
+_ORDINAL_STRS: Final = ['?'] * 256
+_RESISTOR_STRS: Final = ['?'] * 256
+for _i, _c in enumerate("ABCDEFGHIJKLMNOPQRSTUVWXYZ", 1):
+    _ORDINAL_STRS[ord(_c)] = str(_i)
+    _RESISTOR_STRS[ord(_c)] = "-".join([RESISTOR_COLOR_MAP[d] for d in str(_i)])
+for _d, _color in RESISTOR_COLOR_MAP.items():
+    _ORDINAL_STRS[ord(_d)] = _d  # Numbers stay as numbers
+    _RESISTOR_STRS[ord(_d)] = _color
+_ORDINAL_STRS[ord(' ')] = '0'
+_RESISTOR_STRS[ord(' ')] = '(Space)'
+del _i, _c, _d, _color
+
+_ROT13_TABLE: Final = str.maketrans("ABCDEFGHIJKLMNOPQRSTUVWXYZ", "NOPQRSTUVWXYZABCDEFGHIJKLM")
+_ROT13_BYTES: Final = bytes.maketrans(b"ABCDEFGHIJKLMNOPQRSTUVWXYZ", b"NOPQRSTUVWXYZABCDEFGHIJKLM")
+
+def _encode_rot13(text: str) -> str:
+    if text.isascii():
+        return text.encode('ascii').translate(_ROT13_BYTES).decode('ascii')
+    return text.translate(_ROT13_TABLE)
+
+def _to_ternary(n: int) -> str:
+    if n == 0:
+        return "0"
+    # Fill digits from the back; 14 base-3 digits cover every codepoint
+    digits = bytearray(14)
+    i = len(digits)
+    while n:
+        n, d = divmod(n, 3)
+        i -= 1
+        digits[i] = 48 + d
+    return digits[i:].decode('ascii')
+
+_TERNARY_STRS: Final = [_to_ternary(i) for i in range(256)]
+_TERNARY_STRS[ord(' ')] = '100'  # Space has always been written as '100'
+
+# Schemes that join a precomputed token per character:
+# (table, separator, encoder for codepoints past the table)
+_SIMPLE: Final = {
+    "morse": (_lookup_table(MORSE_CODE_MAP), " ", _unknown),
+    "ascii": (_ASCII_STRS, " ", str),
+    "ordinal": (_ORDINAL_STRS, " ", _unknown),
+    "ternary": (_TERNARY_STRS, " ", _to_ternary),
+    "resistor": (_RESISTOR_STRS, " / ", _unknown),
+    "nato": (_lookup_table(NATO_ALPHABET_MAP), " ", _unknown),
+    "semaphore": (_lookup_table(SEMAPHORE_MAP), " | ", _unknown),
+    "maritime": (_lookup_table(MARITIME_FLAGS_MAP), " | ", _unknown),
+    "asl": (_lookup_table(ASL_MAP), " | ", _unknown),
+}
+
+# Schemes that transform the whole text at once
+_HANDLERS: Final = {
+    "braille": _encode_braille,
+    "rot13": _encode_rot13,
+}
+
+# Longer inputs are one-offs not worth evicting repeat phrases for
+_CACHED_TEXT_LENGTH: Final = 512
+
+@lru_cache(maxsize=1024)
+def _encode_cached(text: str, encoding_scheme: str) -> str:
+    return _encode(text, encoding_scheme)
+
+def _encode(text: str, encoding_scheme: str) -> str:
+    text = _upper(text)
+
+    simple = _SIMPLE.get(encoding_scheme)
+    if simple:
+        return _join_lookup(*simple, text)
+
+    handler = _HANDLERS.get(encoding_scheme)
+    return handler(text) if handler else "Unsupported encoding scheme."
+
 def encode_text(text: str, encoding_scheme: str) -> str:
     """Encode text using the specified encoding scheme."""
-    text = text.upper()
-    encoded_chars = []
-
-    if encoding_scheme == "braille":
-        for char in text:
-            encoded_chars.append(BRAILLE_MAP.get(char, '?'))
-        return "".join(encoded_chars)
-    
-    elif encoding_scheme == "morse":
-        for char in text:
-            encoded_chars.append(MORSE_CODE_MAP.get(char, '?'))
-        return " ".join(encoded_chars)
-    
-    elif encoding_scheme == "ascii":
-        for char in text:
-            if char == ' ':
-                encoded_chars.append('32')
-            else:
-                encoded_chars.append(str(ord(char)))
-        return " ".join(encoded_chars)
-    
-    elif encoding_scheme == "ordinal":
-        for char in text:
-            if char == ' ':
-                encoded_chars.append('0')  # Space as 0
-            elif char.isalpha():
-                encoded_chars.append(str(ord(char) - ord('A') + 1))
-            elif char.isdigit():
-                encoded_chars.append(char)  # Numbers stay as numbers
-            else:
-                encoded_chars.append('?')
-        return " ".join(encoded_chars)
-    
-    elif encoding_scheme == "rot13":
-        for char in text:
-            if char.isalpha():
-                shifted = ord(char) - ord('A')
-                shifted = (shifted + 13) % 26
-                encoded_chars.append(chr(shifted + ord('A')))
-            else:
-                encoded_chars.append(char)
-        return "".join(encoded_chars)
-    
-    elif encoding_scheme == "ternary":
-        for char in text:
-            if char == ' ':
-                encoded_chars.append('100')  # Space as base-3 for 32 (space ASCII)
-            else:
-                decimal_val = ord(char)
-                ternary = ""
-                if decimal_val == 0:
-                    ternary = "0"
-                else:
-                    while decimal_val > 0:
-                        ternary = str(decimal_val % 3) + ternary
-                        decimal_val //= 3
-                encoded_chars.append(ternary)
-        return " ".join(encoded_chars)
-    
-    elif encoding_scheme == "resistor":
-        for char in text:
-            if char.isdigit():
-                encoded_chars.append(RESISTOR_COLOR_MAP.get(char, '?'))
-            elif char.isalpha():
-                # Convert letter to ordinal, then to colors
-                ordinal = ord(char) - ord('A') + 1
-                color_sequence = []
-                if ordinal >= 10:
-                    color_sequence.append(RESISTOR_COLOR_MAP.get(str(ordinal // 10), '?'))
-                color_sequence.append(RESISTOR_COLOR_MAP.get(str(ordinal % 10), '?'))
-                encoded_chars.append("-".join(color_sequence))
-            elif char == ' ':
-                encoded_chars.append('(Space)')
-            else:
-                encoded_chars.append('?')
-        return " / ".join(encoded_chars)
-    
-    elif encoding_scheme == "nato":
-        for char in text:
-            encoded_chars.append(NATO_ALPHABET_MAP.get(char, '?'))
-        return " ".join(encoded_chars)
-    
-    elif encoding_scheme == "semaphore":
-        for char in text:
-            encoded_chars.append(SEMAPHORE_MAP.get(char, '?'))
-        return " | ".join(encoded_chars)
-    
-    elif encoding_scheme == "maritime":
-        for char in text:
-            encoded_chars.append(MARITIME_FLAGS_MAP.get(char, '?'))
-        return " | ".join(encoded_chars)
-    
-    elif encoding_scheme == "asl":
-        for char in text:
-            encoded_chars.append(ASL_MAP.get(char, '?'))
-        return " | ".join(encoded_chars)
-    
-    else:
-        return "Unsupported encoding scheme."
+    if len(text) < _CACHED_TEXT_LENGTH:
+        return _encode_cached(text, encoding_scheme)
+    return _encode(text, encoding_scheme)
+
+def encode_texts(texts: Iterable[str], encoding_scheme: str) -> List[str]:
+    """Encode several texts with one scheme, resolving the scheme only once."""
+    simple = _SIMPLE.get(encoding_scheme)
+    if simple:
+        return [_join_lookup(*simple, _upper(text)) for text in texts]
+
+    handler = _HANDLERS.get(encoding_scheme)
+    if handler is None:
+        return ["Unsupported encoding scheme." for _ in texts]
+    return [handler(_upper(text)) for text in texts]
+
+_ENCODING_CHOICES: Final = [
+    {"name": "Braille", "value": sys.intern("braille")},
+    {"name": "Morse Code", "value": sys.intern("morse")},
+    {"name": "ASCII Codepoint", "value": sys.intern("ascii")},
+    {"name": "Alphabet Ordinal (A=1, B=2...)", "value": sys.intern("ordinal")},
+    {"name": "ROT13", "value": sys.intern("rot13")},
+    {"name": "Ternary (Base 3)", "value": sys.intern("ternary")},
+    {"name": "Resistor Colors", "value": sys.intern("resistor")},
+    {"name": "NATO Phonetic Alphabet", "value": sys.intern("nato")},
+    {"name": "Semaphore Flags", "value": sys.intern("semaphore")},
+    {"name": "Maritime Signal Flags", "value": sys.intern("maritime")},
+    {"name": "American Sign Language", "value": sys.intern("asl")}
+]
 
 def get_encoding_choices():
-    """Return the list of encoding choices for Discord command."""
-    return [
-        {"name": "Braille", "value": "braille"},
-        {"name": "Morse Code", "value": "morse"},
-        {"name": "ASCII Codepoint", "value": "ascii"},
-        {"name": "Alphabet Ordinal (A=1, B=2...)", "value": "ordinal"},
-        {"name": "ROT13", "value": "rot13"},
-        {"name": "Ternary (Base 3)", "value": "ternary"},
-        {"name": "Resistor Colors", "value": "resistor"},
-        {"name": "NATO Phonetic Alphabet", "value": "nato"},
-        {"name": "Semaphore Flags", "value": "semaphore"},
-        {"name": "Maritime Signal Flags", "value": "maritime"},
-        {"name": "American Sign Language", "value": "asl"}
-    ] 
\ No newline at end of file
+    """Return the list of encoding choices for Discord command (shared, don't mutate)."""
+    return _ENCODING_CHOICES
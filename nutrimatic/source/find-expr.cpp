@@ -5,29 +5,61 @@
 #include "fst/concat.h"
 
 #include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <sys/resource.h>
+
+#include <iostream>
+#include <string>
 
 using namespace fst;
 
-int main(int argc, char *argv[]) {
-  if (argc != 3 || strlen(argv[2]) == 0) {
-    fprintf(stderr, "usage: %s input.index expression\n", argv[0]);
-    return 2;
-  }
+// Per-query limits for server mode.  A max_results of 0 means no limit.
+struct Limits {
+  long long max_results;
+  long long max_computation;
+  double min_score;
+};
 
-  SymbolTable *chars = new SymbolTable("chars");
-  chars->AddSymbol("epsilon", 0);
-  chars->AddSymbol("space", ' ');
-  for (int i = 33; i <= 127; ++i)
-    chars->AddSymbol(std::string(1, i), i);
+// Like PrintAll, but stop after max_results results, before the first result
+// scoring below min_score, or once max_computation steps have run.  Hitting
+// the step limit is reported as "#LIMIT_REACHED:<steps>" in place of that
+// progress line, so the caller never has to kill the search.
+static void PrintLimited(SearchDriver* d, const Limits& limits) {
+  long long count = 0, results = 0;
+  for (;;) {
+    if (!(++count % 100000)) {
+      if (count >= limits.max_computation) {
+        printf("#LIMIT_REACHED:%lld\n", count);
+        return;
+      }
+      printf("# %lld\n", count);
+      fflush(stdout);
+    }
+    if (d->step()) {
+      if (d->text == NULL || d->score < limits.min_score) return;
+      int len = strlen(d->text);
+      while (len > 0 && d->text[len - 1] == ' ') --len;
+      printf("%.8g %.*s\n", d->score, len, d->text);
+      if (++results == limits.max_results) return;
+    }
+  }
+}
 
+// Parse "expr" and print every match in "reader" (within "limits", if
+// given).  On a parse error, print a message to "err" (prefixed with
+// "prefix") and return false.
+static bool Search(const IndexReader& reader, const SymbolTable* chars,
+                   const char* expr, const Limits* limits,
+                   FILE* err, const char* prefix) {
   StdVectorFst parsed;
   parsed.SetInputSymbols(chars);
   parsed.SetOutputSymbols(chars);
 
-  const char *p = ParseExpr(argv[2], &parsed, false);
+  const char *p = ParseExpr(expr, &parsed, false);
   if (p == NULL || *p != '\0') {
-    fprintf(stderr, "error: can't parse \"%s\"\n", p ? p : argv[2]);
-    return 2;
+    fprintf(err, "%scan't parse \"%s\"\n", prefix, p ? p : expr);
+    return false;
   }
 
   // Require a space at the end, so the matches must be complete words.
@@ -35,15 +67,94 @@ int main(int argc, char *argv[]) {
   ParseExpr(" ", &space, true);
   Concat(&parsed, space);
 
+  ExprFilter filter(parsed);
+  SearchDriver driver(&reader, &filter, filter.start(), 1e-6);
+  if (limits != NULL)
+    PrintLimited(&driver, *limits);
+  else
+    PrintAll(&driver);
+  return true;
+}
+
+// RLIMIT_CPU counts the whole process lifetime, so a long-running server
+// moves the soft limit forward to give each query a fresh "budget" seconds.
+static void ResetCpuLimit(rlim_t budget) {
+  struct rusage usage;
+  struct rlimit limit;
+  if (budget == RLIM_INFINITY) return;
+  if (getrusage(RUSAGE_SELF, &usage) != 0) return;
+  if (getrlimit(RLIMIT_CPU, &limit) != 0) return;
+
+  rlim_t used = usage.ru_utime.tv_sec + usage.ru_stime.tv_sec + 1;
+  limit.rlim_cur = used + budget;
+  if (limit.rlim_max != RLIM_INFINITY && limit.rlim_cur > limit.rlim_max)
+    limit.rlim_cur = limit.rlim_max;
+  setrlimit(RLIMIT_CPU, &limit);
+}
+
+// Split a "<max_results> <max_computation> <min_score> <expr>" request line.
+static bool ParseRequest(const char* line, Limits* limits, const char** expr) {
+  char* end;
+  limits->max_results = strtoll(line, &end, 10);
+  if (end == line || *end != ' ') return false;
+  line = end + 1;
+  limits->max_computation = strtoll(line, &end, 10);
+  if (end == line || *end != ' ') return false;
+  line = end + 1;
+  limits->min_score = strtod(line, &end);
+  if (end == line || *end != ' ') return false;
+  *expr = end + 1;
+  return true;
+}
+
+// Read one request per line from stdin and answer each in turn, ending
+// every answer with a "#END" line.  Each request carries its own limits, so
+// a search stops by itself and the process stays usable.  Parse errors are
+// reported in-band as "#ERROR:..." lines for the same reason.
+static int Serve(const IndexReader& reader, const SymbolTable* chars) {
+  struct rlimit limit;
+  rlim_t budget = RLIM_INFINITY;
+  if (getrlimit(RLIMIT_CPU, &limit) == 0) budget = limit.rlim_cur;
+
+  std::string line;
+  while (std::getline(std::cin, line)) {
+    ResetCpuLimit(budget);
+    Limits limits;
+    const char* expr;
+    if (line.empty()) {
+      // Nothing to answer
+    } else if (ParseRequest(line.c_str(), &limits, &expr)) {
+      Search(reader, chars, expr, &limits, stdout, "#ERROR:error: ");
+    } else {
+      fputs("#ERROR:error: bad request line\n", stdout);
+    }
+    fputs("#END\n", stdout);
+    fflush(stdout);
+  }
+  return 0;
+}
+
+int main(int argc, char *argv[]) {
+  if (argc < 2 || argc > 3 || (argc == 3 && strlen(argv[2]) == 0)) {
+    fprintf(stderr, "usage: %s input.index [expression]\n", argv[0]);
+    fprintf(stderr, "(with no expression, reads one request per line from stdin:\n");
+    fprintf(stderr, " \"<max_results> <max_computation> <min_score> <expression>\")\n");
+    return 2;
+  }
+
+  SymbolTable *chars = new SymbolTable("chars");
+  chars->AddSymbol("epsilon", 0);
+  chars->AddSymbol("space", ' ');
+  for (int i = 33; i <= 127; ++i)
+    chars->AddSymbol(std::string(1, i), i);
+
   FILE *fp = fopen(argv[1], "rb");
   if (fp == NULL) {
     fprintf(stderr, "error: can't open \"%s\"\n", argv[1]);
     return 1;
   }
 
-  ExprFilter filter(parsed);
   IndexReader reader(fp);
-  SearchDriver driver(&reader, &filter, filter.start(), 1e-6);
-  PrintAll(&driver);
-  return 0;
+  if (argc == 2) return Serve(reader, chars);
+  return Search(reader, chars, argv[2], NULL, stderr, "error: ") ? 0 : 2;
 }